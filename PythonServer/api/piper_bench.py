@@ -0,0 +1,59 @@
+# PythonServer/piper_bench.py
+# smoke check + rtf bench for piper voices, same load path as the server (tts_api._piper)
+# usage: python PythonServer/api/piper_bench.py [--runs 5]
+# loads + synthesizes every voice in PIPER_MODELS (base and int8 variant if built), prints rtf
+# rtf = synth seconds / audio seconds (lower = faster). no voice files => skip, exit 0
+# imports tts_api (torch etc.), but with TTS_WARMUP=0 => no aligner/voice warmup, only piper voices get loaded
+import os, sys, time, json, argparse
+os.environ.setdefault("TTS_WARMUP", "0")
+import tts_api
+
+TEXTS = {
+    "de": "Hallo, ich bin dein Avatar. Wie kann ich dir heute helfen?",
+    "en": "Hello, I am your avatar. How can I help you today?",
+}
+
+def _bench(onnx, cfg, text, runs):
+    wav, sr, dur = tts_api._synthesize_wav(text, onnx, cfg)  # warmup (+ load)
+    with open(cfg, "r", encoding="utf-8") as f:
+        want_sr = int(json.load(f).get("audio", {}).get("sample_rate", sr))
+    if not wav or dur <= 0: raise RuntimeError("empty audio")
+    if sr != want_sr: raise RuntimeError(f"sample rate {sr} != config {want_sr}")
+    best = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        _, _, dur = tts_api._synthesize_wav(text, onnx, cfg)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best / dur, dur
+
+def _positive_int(v):
+    n = int(v)
+    if n < 1: raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Piper load/synthesize smoke check + RTF bench")
+    ap.add_argument("--runs", type=_positive_int, default=5)
+    args = ap.parse_args(argv)
+
+    ok, done = True, 0
+    for l in ("de", "en"):
+        for g in ("male", "female"):
+            try: base, cfg = tts_api._select_voice(l, g, variants=False)
+            except FileNotFoundError as e:
+                print(f"skip {l}/{g}: {e}"); continue
+            paths = [base]
+            var, _ = tts_api._select_voice(l, g, variants=True)
+            if var != base: paths.append(var)
+            for p in paths:
+                try:
+                    rtf, dur = _bench(p, cfg, tts_api._normalize_text(TEXTS[l], l), args.runs)
+                    print(f"{os.path.basename(p):40s} rtf={rtf:.3f} audio={dur:.2f}s"); done += 1
+                except Exception as e:
+                    print(f"FAIL {os.path.basename(p)}: {type(e).__name__}: {e}"); ok = False
+    if not done and ok: print("no piper voices found in", tts_api.VOICE_DIR, "- skipped")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
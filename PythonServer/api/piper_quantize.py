@@ -0,0 +1,70 @@
+# PythonServer/piper_quantize.py
+# offline step: int8 quantize piper voices + cache ort-optimized graph next to the base voice
+# usage: python PythonServer/api/piper_quantize.py de_DE-thorsten-high.onnx en_US-ryan-high.onnx
+# result: <voice>.int8.onnx, pick it via PIPER_MODELS["variants"] + PIPER_VARIANTS=1 in tts_api.py
+import os, sys, argparse, tempfile, logging
+import onnxruntime as ort
+from onnxruntime.quantization import quantize_dynamic, QuantType
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+log = logging.getLogger("piper_quantize")
+
+_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+MODEL_ROOT = os.environ.get("HISTAR_MODEL_DIR", os.path.join(_BASE, "models"))
+VOICE_DIR = os.environ.get("PIPER_VOICE_DIR", os.path.join(MODEL_ROOT, "piper_voices"))
+
+DEFAULT_VOICES = ["de_DE-thorsten-high.onnx", "en_US-ryan-high.onnx"]
+
+# only MatMul (text encoder / flow attention). Conv -> ConvInteger has slow cpu kernels + hurts audio in the vits decoder
+QUANT_OP_TYPES = ["MatMul"]
+
+def _variant_path(onnx_path):
+    return os.path.splitext(onnx_path)[0] + ".int8.onnx"
+
+def _optimize(src, dst):
+    # extended (not all) => saved graph stays portable between cpus
+    # https://onnxruntime.ai/docs/performance/model-optimizations/graph-optimizations.html#online-offline-mode
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    so.optimized_model_filepath = dst
+    ort.InferenceSession(src, sess_options=so, providers=["CPUExecutionProvider"])
+
+def build_variant(onnx_path, force=False):
+    dst = _variant_path(onnx_path)
+    if os.path.exists(dst) and not force:
+        log.info("skip (exists): %s", dst)
+        return dst
+    # tmp dir next to dst, else os.replace fails across filesystems (tmpfs /tmp, mounted model volume)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(dst)) as tmp:
+        # https://onnxruntime.ai/docs/performance/model-optimizations/quantization.html#pre-processing
+        pre = os.path.join(tmp, "pre.onnx")
+        quant_pre_process(onnx_path, pre)
+        # dynamic quant, weights only int8 (no calibration data needed)
+        quant = os.path.join(tmp, "quant.onnx")
+        quantize_dynamic(pre, quant, weight_type=QuantType.QInt8, op_types_to_quantize=QUANT_OP_TYPES)
+        out = os.path.join(tmp, "opt.onnx")
+        _optimize(quant, out)
+        os.replace(out, dst)
+    log.info("wrote %s (%.1f MB -> %.1f MB)", dst,
+             os.path.getsize(onnx_path) / 1e6, os.path.getsize(dst) / 1e6)
+    return dst
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build int8 piper voice variants (<voice>.int8.onnx)")
+    ap.add_argument("voices", nargs="*", default=DEFAULT_VOICES, help="voice .onnx names (in PIPER_VOICE_DIR) or paths")
+    ap.add_argument("--force", action="store_true", help="rebuild even if variant exists")
+    args = ap.parse_args(argv)
+
+    ok = True
+    for v in args.voices:
+        p = v if os.path.isabs(v) else os.path.join(VOICE_DIR, v)
+        if not os.path.exists(p):
+            log.error("voice not found: %s", p); ok = False; continue
+        try: build_variant(p, force=args.force)
+        except Exception as e:
+            log.error("failed %s: %s", p, e); ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s: %(message)s")
+    sys.exit(main())
@@ -1,12 +1,15 @@
 from flask import Blueprint, request, jsonify, abort
-import os, io, wave, re, tempfile, base64, logging, traceback, threading
+import os, io, wave, re, json, tempfile, base64, logging, traceback, threading
 from functools import lru_cache
 from werkzeug.exceptions import HTTPException
 import torch, torch.jit as _jit
+import onnxruntime as ort
 from piper.voice import PiperVoice
+from piper.config import PiperConfig
 
 TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "1"))
 BFA_GROUPS = bool(int(os.getenv("BFA_GROUPS", "0")))
+TTS_WARMUP = bool(int(os.getenv("TTS_WARMUP", "1")))  # 0 = skip voice/aligner warmup at import (piper_bench.py)
 os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
 os.environ.setdefault("TORCHAUDIO_USE_FFMPEG", "0")
 os.environ.setdefault("TORCHAUDIO_USE_SOUNDFILE", "1")
@@ -51,7 +54,66 @@ BFA_DIR = os.environ.get("BFA_DIR", os.path.join(MODEL_ROOT, "bfa"))
 PIPER_MODELS = {
     "de": {"male": "de_DE-thorsten-high.onnx", "female": "de_DE-kerstin-low.onnx"},
     "en": {"male": "en_US-ryan-high.onnx", "female": "en_US-amy-medium.onnx"},
+    # optimized variants (built offline by piper_quantize.py), used if PIPER_VARIANTS=1 and file exists
+    "variants": {
+        "de_DE-thorsten-high.onnx": "de_DE-thorsten-high.int8.onnx",
+        "en_US-ryan-high.onnx": "en_US-ryan-high.int8.onnx",
+    },
 }
+PIPER_VARIANTS = bool(int(os.getenv("PIPER_VARIANTS", "0")))
+
+_ORT_OPT_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+PIPER_ORT_OPT_LEVEL = os.getenv("PIPER_ORT_OPT_LEVEL", "all").strip().lower()
+if PIPER_ORT_OPT_LEVEL not in _ORT_OPT_LEVELS:
+    log.warning("PIPER_ORT_OPT_LEVEL=%r invalid (disable|basic|extended|all), using all", PIPER_ORT_OPT_LEVEL)
+    PIPER_ORT_OPT_LEVEL = "all"
+
+# onnxruntime session defaults, see https://onnxruntime.ai/docs/performance/tune-performance/threading.html
+# defaults = plain ort.SessionOptions() (threads 0 => ort picks, all physical cores), only tune via env
+PIPER_ORT_DEFAULTS = {
+    "graph_optimization": PIPER_ORT_OPT_LEVEL,  # disable|basic|extended|all
+    "intra_op_threads": int(os.getenv("PIPER_ORT_THREADS", "0")),
+    "inter_op_threads": int(os.getenv("PIPER_ORT_INTEROP_THREADS", "0")),
+    "mem_arena": bool(int(os.getenv("PIPER_ORT_MEM_ARENA", "1"))),
+    "parallel": bool(int(os.getenv("PIPER_ORT_PARALLEL", "0"))),
+}
+# per voice overrides (key = base model name), e.g. PIPER_ORT_VOICES='{"de_DE-thorsten-high.onnx": {"intra_op_threads": 2}}'
+PIPER_ORT_VOICES = {}
+def _ort_value(key, val):
+    # same parsing as the env values above, type taken from the default
+    default = PIPER_ORT_DEFAULTS[key]
+    if key == "graph_optimization":
+        val = str(val).strip().lower()
+        if val not in _ORT_OPT_LEVELS: raise ValueError(f"unknown opt level {val!r}")
+        return val
+    if isinstance(default, bool): return bool(int(val))
+    val = int(val)
+    if val < 0: raise ValueError(f"negative thread count {val}")
+    return val
+
+def _load_ort_voice_overrides(raw):
+    try: d = json.loads(raw or "{}")
+    except ValueError as e:
+        log.warning("PIPER_ORT_VOICES ignored, invalid json: %s", e); return
+    if not isinstance(d, dict):
+        log.warning("PIPER_ORT_VOICES ignored, expected object not %s", type(d).__name__); return
+    for k, v in d.items():
+        if not isinstance(v, dict):
+            log.warning("PIPER_ORT_VOICES[%s] ignored, expected object", k); continue
+        opts = {}
+        for key, val in v.items():
+            if key not in PIPER_ORT_DEFAULTS:
+                log.warning("PIPER_ORT_VOICES[%s].%s ignored, unknown key (%s)", k, key, "|".join(PIPER_ORT_DEFAULTS)); continue
+            try: opts[key] = _ort_value(key, val)
+            except (TypeError, ValueError) as e:
+                log.warning("PIPER_ORT_VOICES[%s].%s=%r ignored: %s", k, key, val, e)
+        PIPER_ORT_VOICES.setdefault(k, {}).update(opts)
+_load_ort_voice_overrides(os.getenv("PIPER_ORT_VOICES"))
 BFA_BY_LANG = {
     "en": os.getenv("BFA_EN", "en_libri1000_uj01d_e199_val_GER=0.2307.ckpt"),
     "de": os.getenv("BFA_DE", "multi_MLS8_uh02_e36_val_GER=0.2334.ckpt"),
@@ -97,21 +159,52 @@ def _normalize_text(text, lang):
 def _resolve_path(base_dir, name_or_path):
     return name_or_path if os.path.isabs(name_or_path) else os.path.join(base_dir, name_or_path)
 
-def _select_voice(lang, gender):
+_VARIANT_MISSING_WARNED = set()
+
+def _select_voice(lang, gender, variants=None):
     l = "en" if str(lang).lower().startswith("en") else "de"
     g = "female" if str(gender).lower().startswith("f") else "male"
-    onnx = _resolve_path(VOICE_DIR, PIPER_MODELS[l][g])
+    name = PIPER_MODELS[l][g]
+    onnx = _resolve_path(VOICE_DIR, name)
     if not os.path.exists(onnx): raise FileNotFoundError(onnx)
     cfg = onnx + ".json"
     alt = os.path.splitext(onnx)[0] + ".json"
     if not os.path.exists(cfg) and os.path.exists(alt): cfg = alt
-    if not os.path.exists(cfg): cfg = None
+    # piper needs the config, name the base voice json (variant shares it)
+    if not os.path.exists(cfg): raise FileNotFoundError(onnx + ".json")
+    if variants is None: variants = PIPER_VARIANTS
+    variant = PIPER_MODELS["variants"].get(name) if variants else None
+    if variant:
+        vpath = _resolve_path(VOICE_DIR, variant)
+        if os.path.exists(vpath): onnx = vpath
+        elif vpath not in _VARIANT_MISSING_WARNED:
+            _VARIANT_MISSING_WARNED.add(vpath)
+            log.warning("piper variant missing, using base: %s", vpath)
     return onnx, cfg
 
+def _ort_options(onnx_path):
+    base = os.path.basename(onnx_path)
+    base_name = next((k for k, v in PIPER_MODELS["variants"].items() if v == base), base)
+    cfg = dict(PIPER_ORT_DEFAULTS)
+    cfg.update(PIPER_ORT_VOICES.get(base_name) or {})
+    so = ort.SessionOptions()
+    # values already validated at import (_load_ort_voice_overrides)
+    so.graph_optimization_level = _ORT_OPT_LEVELS[cfg["graph_optimization"]]
+    so.intra_op_num_threads = cfg["intra_op_threads"]
+    so.inter_op_num_threads = cfg["inter_op_threads"]
+    so.enable_cpu_mem_arena = cfg["mem_arena"]
+    so.execution_mode = ort.ExecutionMode.ORT_PARALLEL if cfg["parallel"] else ort.ExecutionMode.ORT_SEQUENTIAL
+    return so, cfg
+
 @lru_cache(maxsize=8)
 def _piper(onnx_path, cfg_path):
-    if cfg_path: return PiperVoice.load(onnx_path, config_path=cfg_path)
-    return PiperVoice.load(onnx_path)
+    # same as PiperVoice.load, but with our own session options (cpu only)
+    with open(cfg_path, "r", encoding="utf-8") as f:
+        config = PiperConfig.from_dict(json.load(f))
+    so, cfg = _ort_options(onnx_path)
+    sess = ort.InferenceSession(onnx_path, sess_options=so, providers=["CPUExecutionProvider"])
+    log.info("piper loaded %s ort=%s", os.path.basename(onnx_path), cfg)
+    return PiperVoice(session=sess, config=config)
 
 def _synthesize_wav(text, onnx_path, cfg_path):
     v = _piper(onnx_path, cfg_path)
@@ -158,7 +251,7 @@ def _bootstrap():
         _ = _aligner(BFA_BY_LANG["de"], "de"); _ = _aligner(BFA_BY_LANG["en"], "en-us")
     except Exception as e: log.warning("aligner warmup: %s", e)
 
-_bootstrap()
+if TTS_WARMUP: _bootstrap()
 
 @tts_blueprint.errorhandler(HTTPException)
 def _http_error(e):
@@ -253,7 +346,8 @@ def tts_align():
                 "audio_seconds":dur,
                 "phoneme_count":len(segs),
                 "do_groups":BFA_GROUPS,
-                "torch_threads": TORCH_NUM_THREADS
+                "torch_threads": TORCH_NUM_THREADS,
+                "piper_model": os.path.basename(onnx)
             },
             audio_base64=base64.b64encode(wav).decode("ascii"),
             normalized_text=tnorm,